@@ -0,0 +1,98 @@
+import { describe, it, expect } from 'vitest';
+import { buildContext, extractCallStack } from './agent-runner.js';
+
+function inner(): never {
+  throw new TypeError('test error');
+}
+
+function outer() {
+  inner();
+}
+
+function captureSampleError(): Error {
+  try {
+    outer();
+  } catch (error) {
+    return error as Error;
+  }
+  throw new Error('outer() did not throw');
+}
+
+// Built once and shared by every test that inspects an error
+const sampleError = captureSampleError();
+
+describe('extractCallStack', () => {
+  it('should extract frames from an error', () => {
+    const stack = extractCallStack(sampleError, 1, 8);
+    expect(stack.length).toBeGreaterThan(0);
+    expect(stack.length).toBeLessThanOrEqual(8);
+    expect(stack[0].functionName).toBe('inner');
+    expect(stack[0].filePath).toContain('agent-runner.test.ts');
+    const names = new Set(stack.map((frame) => frame.functionName));
+    expect(names.has('outer')).toBe(true);
+  });
+
+  it('should extract frames from the current execution point', () => {
+    function captureHere() {
+      return extractCallStack(undefined, 1, 8);
+    }
+
+    const stack = captureHere();
+    expect(stack.length).toBeLessThanOrEqual(8);
+    const names = new Set(stack.map((frame) => frame.functionName));
+    expect(names.has('captureHere')).toBe(true);
+  });
+
+  it('should return equal but independent frames for repeated calls', () => {
+    const capture = () => extractCallStack(undefined, 1, 8);
+
+    const first = capture();
+    const second = capture();
+    expect(second[0]).toEqual(first[0]);
+    expect(second[0]).not.toBe(first[0]);
+  });
+
+  it('should stop after maxDepth frames', () => {
+    const stack = extractCallStack(undefined, 1, 1);
+    expect(stack).toHaveLength(1);
+  });
+});
+
+class Counter {
+  count = 0;
+  increment() {
+    this.count++;
+  }
+}
+
+describe('buildContext', () => {
+  it.each([
+    {
+      label: 'simple values',
+      context: { x: 42, y: 'hello' },
+      items: [
+        { name: 'x', type: 'number', description: undefined },
+        { name: 'y', type: 'string', description: undefined },
+      ],
+    },
+    {
+      label: 'Error values with message and stack',
+      context: { error: sampleError },
+      items: [
+        { name: 'error', type: 'TypeError', description: expect.stringMatching(/^Message: test error\nStack:\n/) },
+      ],
+    },
+    {
+      label: 'own and prototype methods once each',
+      context: { counter: Object.assign(new Counter(), { increment() {}, reset() {} }) },
+      items: [
+        { name: 'counter', type: 'object', description: 'Available methods: increment, reset, constructor' },
+      ],
+    },
+  ])('should describe $label', ({ context, items }) => {
+    const { contextVars, contextItems } = buildContext(context);
+
+    expect(contextVars).toEqual(context);
+    expect(contextItems).toEqual(items);
+  });
+});
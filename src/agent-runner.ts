@@ -2,44 +2,88 @@ import { fileURLToPath } from 'node:url';
 import type { StackFrame, ContextItem as ContextItemType } from '@/utils/types.js';
 import { TRACE } from '@/utils/logging.js';
 
+// Matches patterns like:
+// "    at functionName (file:///path/file.ts:10:5)"
+// "    at file:///path/file.ts:10:5"
+const STACK_FRAME_PATTERN = /at\s+(?:(.+?)\s+\()?(.+?):(\d+):(\d+)\)?$/;
+
+/**
+ * Whether a frame belongs to a dependency or Node.js internals
+ */
+function isExternalFrame(filePath: string): boolean {
+  return filePath.includes('node_modules') || filePath.startsWith('node:');
+}
+
+// Parsed frames keyed by stack line; hot call sites produce the same lines
+// repeatedly, and null marks lines that yield no frame
+const MAX_CACHED_FRAMES = 1024;
+const frameCache = new Map<string, StackFrame | null>();
+
+/**
+ * Parses one stack line into a frame, or null if it should be skipped
+ */
+function parseStackLine(line: string): StackFrame | null {
+  let frame = frameCache.get(line);
+  if (frame !== undefined) {
+    return frame;
+  }
+
+  frame = null;
+  const match = STACK_FRAME_PATTERN.exec(line);
+  if (match) {
+    const [, functionName, filePath, lineStr, columnStr] = match;
+    if (!isExternalFrame(filePath)) {
+      try {
+        const actualPath = filePath.startsWith('file://')
+          ? fileURLToPath(filePath)
+          : filePath;
+        frame = {
+          filePath: actualPath,
+          line: parseInt(lineStr, 10),
+          column: parseInt(columnStr, 10),
+          functionName: functionName?.trim(),
+        };
+      } catch {
+        // Skip invalid paths
+      }
+    }
+  }
+
+  if (frameCache.size >= MAX_CACHED_FRAMES) {
+    frameCache.delete(frameCache.keys().next().value!);
+  }
+  frameCache.set(line, frame);
+  return frame;
+}
+
 /**
- * Extracts call stack from an error or current execution point
+ * Extracts call stack from an error or current execution point, keeping at
+ * most maxDepth frames
  */
-export function extractCallStack(error?: Error, skipFrames: number = 2): StackFrame[] {
+export function extractCallStack(error?: Error, skipFrames: number = 2, maxDepth: number = 32): StackFrame[] {
   const stack = error?.stack || new Error().stack || '';
   const stackLines = stack.split('\n');
   const frames: StackFrame[] = [];
 
   // Skip first N lines (Error message and calling functions)
-  for (let i = skipFrames; i < stackLines.length; i++) {
-    const line = stackLines[i];
-    // Match patterns like:
-    // "    at functionName (file:///path/file.ts:10:5)"
-    // "    at file:///path/file.ts:10:5"
-    const match = line.match(/at\s+(?:(.+?)\s+\()?([^:)]+):(\d+):(\d+)/);
-    if (match) {
-      const [, functionName, filePath, lineStr, columnStr] = match;
-      if (!filePath.includes('node_modules') && !filePath.startsWith('node:')) {
-        try {
-          const actualPath = filePath.startsWith('file://')
-            ? fileURLToPath(filePath)
-            : filePath;
-          frames.push({
-            filePath: actualPath,
-            line: parseInt(lineStr, 10),
-            column: parseInt(columnStr, 10),
-            functionName: functionName?.trim(),
-          });
-        } catch {
-          // Skip invalid paths
-        }
-      }
+  for (let i = skipFrames; i < stackLines.length && frames.length < maxDepth; i++) {
+    const frame = parseStackLine(stackLines[i]);
+    if (frame) {
+      // Copy so callers never share a cached frame
+      frames.push({ ...frame });
     }
   }
 
   return frames;
 }
 
+/**
+ * Describes an Error context value by its message and stack
+ */
+function describeError(error: Error): string {
+  return `Message: ${error.message}\nStack:\n${error.stack}`;
+}
+
 /**
  * Builds context items and vars from input
  */
@@ -55,31 +99,29 @@ export function buildContext(context: {
 
   for (const [key, value] of Object.entries(contextEntries)) {
     contextVars[key] = value;
+    const type = typeof value;
 
-    // Special handling for Error objects
-    if (value instanceof Error) {
-      const type = value.constructor.name;
-      const description = `Message: ${value.message}\nStack:\n${value.stack}`;
-
+    // Special handling for Error objects (only objects need the prototype chain check)
+    if (type === 'object' && value instanceof Error) {
       contextItems.push({
         name: key,
-        type,
-        description,
+        type: value.constructor.name,
+        description: describeError(value),
       });
     } else {
-      const type = typeof value;
       let description: string | undefined;
 
       // Extract methods from objects
       if (type === 'object' && value !== null) {
         try {
-          const methods: string[] = [];
+          // Set keeps insertion order and makes the duplicate check O(1)
+          const methods = new Set<string>();
           const obj = value as Record<string, unknown>;
 
           // Get all properties and methods
           for (const prop in obj) {
             if (typeof obj[prop] === 'function' && !prop.startsWith('__')) {
-              methods.push(prop);
+              methods.add(prop);
             }
           }
 
@@ -87,14 +129,14 @@ export function buildContext(context: {
           const proto = Object.getPrototypeOf(obj);
           if (proto) {
             for (const prop of Object.getOwnPropertyNames(proto)) {
-              if (typeof proto[prop] === 'function' && !prop.startsWith('__') && !methods.includes(prop)) {
-                methods.push(prop);
+              if (typeof proto[prop] === 'function' && !prop.startsWith('__')) {
+                methods.add(prop);
               }
             }
           }
 
-          if (methods.length > 0) {
-            description = `Available methods: ${methods.join(', ')}`;
+          if (methods.size > 0) {
+            description = `Available methods: ${[...methods].join(', ')}`;
           }
         } catch {
           // Silently ignore if we can't extract methods
@@ -1,11 +1,24 @@
 import { createHash } from 'crypto';
-import { join } from 'path';
-import { readFileSync, writeFileSync, existsSync } from 'fs';
-import { mkdirSync } from 'fs';
+import { dirname, join } from 'path';
+import { readFileSync, existsSync } from 'fs';
+import { mkdir, writeFile } from 'fs/promises';
 import { TRACE } from '@/utils/logging.js';
 
+// Project root per working directory, so the directory walk runs once
+const projectRoots = new Map<string, string>();
+
 function findProjectRoot(): string {
-  let current = process.cwd();
+  const cwd = process.cwd();
+  let root = projectRoots.get(cwd);
+  if (root === undefined) {
+    root = walkToProjectRoot(cwd);
+    projectRoots.set(cwd, root);
+  }
+  return root;
+}
+
+function walkToProjectRoot(cwd: string): string {
+  let current = cwd;
   while (current !== '/') {
     // Prefer .klendathu as project marker
     if (existsSync(join(current, '.klendathu'))) {
@@ -18,7 +31,7 @@ function findProjectRoot(): string {
     current = join(current, '..');
   }
   // No .klendathu or .git found, use cwd
-  return process.cwd();
+  return cwd;
 }
 
 function slugify(text: string): string {
@@ -30,16 +43,25 @@ function slugify(text: string): string {
     .replace(/^_+|_+$/g, '');
 }
 
-export function getCacheKey(prompt: string, schema: any): string {
-  const combined = `${prompt}:::${JSON.stringify(schema)}`;
+/**
+ * Derives the cache key from the prompt and the schema as serialized by JSON.stringify
+ */
+export function getCacheKey(prompt: string, serializedSchema: string): string {
+  const combined = `${prompt}:::${serializedSchema}`;
   const hash = createHash('sha256').update(combined).digest('hex');
   const slug = slugify(prompt);
   return `${slug}_${hash}`;
 }
 
+/**
+ * KLENDATHU_CACHE short-circuits the project root lookup entirely
+ */
+function getCacheDir(): string {
+  return process.env.KLENDATHU_CACHE || join(findProjectRoot(), '.klendathu', 'cache');
+}
+
 export function getCachePath(cacheKey: string): string {
-  const cacheDir = process.env.KLENDATHU_CACHE || join(findProjectRoot(), '.klendathu', 'cache');
-  return join(cacheDir, `${cacheKey}.json`);
+  return join(getCacheDir(), `${cacheKey}.json`);
 }
 
 export function loadCachedTranscript(cachePath: string): any | null {
@@ -64,11 +86,10 @@ export function loadCachedTranscript(cachePath: string): any | null {
   }
 }
 
-export function saveCachedTranscript(cachePath: string, transcript: any): void {
+export async function saveCachedTranscript(cachePath: string, transcript: any): Promise<void> {
   try {
-    const cacheDir = process.env.KLENDATHU_CACHE || join(findProjectRoot(), '.klendathu', 'cache');
-    mkdirSync(cacheDir, { recursive: true });
-    writeFileSync(cachePath, JSON.stringify(transcript, null, 2));
+    await mkdir(dirname(cachePath), { recursive: true });
+    await writeFile(cachePath, JSON.stringify(transcript, null, 2));
     TRACE`Saved transcript to cache: ${cachePath}`;
   } catch (err) {
     TRACE`Failed to save cached transcript: ${err}`;
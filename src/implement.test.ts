@@ -0,0 +1,106 @@
+import { describe, it, expect, vi, beforeEach, afterEach } from 'vitest';
+import { mkdtemp, readdir, readFile, rm } from 'node:fs/promises';
+import { tmpdir } from 'node:os';
+import { join } from 'node:path';
+import { z } from 'zod';
+import { implement } from './implement.js';
+
+type ToolHandler = (args: Record<string, unknown>) => Promise<unknown>;
+type AgentOptions = {
+  mcpServers: { klendathu: { tools: Array<{ name: string; handler: ToolHandler }> } };
+  abortController: AbortController;
+};
+
+const sdk = vi.hoisted(() => ({
+  agent: undefined as ((options: AgentOptions) => AsyncGenerator<unknown>) | undefined,
+  options: undefined as AgentOptions | undefined,
+}));
+
+// Replace the agent with scripted generators that drive the real in-process tools
+vi.mock('@anthropic-ai/claude-agent-sdk', () => ({
+  tool: (name: string, description: string, inputSchema: unknown, handler: unknown) => ({ name, description, inputSchema, handler }),
+  createSdkMcpServer: (options: unknown) => options,
+  query: ({ options }: { options: AgentOptions }) => {
+    sdk.options = options;
+    return sdk.agent!(options);
+  },
+}));
+
+function callTool(options: AgentOptions, name: string, args: Record<string, unknown>) {
+  return options.mcpServers.klendathu.tools.find((t) => t.name === name)!.handler(args);
+}
+
+// Stands in for an agent that never produces another message
+const never = () => new Promise<never>(() => {});
+
+describe('implement', () => {
+  const originalCacheDir = process.env.KLENDATHU_CACHE;
+  let cacheDir: string;
+
+  beforeEach(async () => {
+    cacheDir = await mkdtemp(join(tmpdir(), 'klendathu-'));
+    process.env.KLENDATHU_CACHE = cacheDir;
+  });
+
+  afterEach(async () => {
+    if (originalCacheDir === undefined) {
+      delete process.env.KLENDATHU_CACHE;
+    } else {
+      process.env.KLENDATHU_CACHE = originalCacheDir;
+    }
+    await rm(cacheDir, { recursive: true, force: true });
+  });
+
+  it('should reject and save a failed transcript when the agent finishes without a result', async () => {
+    sdk.agent = async function* () {
+      yield { type: 'assistant' };
+    };
+
+    await expect(implement('Finish without a result', {}, { answer: z.number() })).rejects.toThrow(
+      'Agent finished without calling set_result or bail'
+    );
+
+    const [file] = await readdir(cacheDir);
+    const transcript = JSON.parse(await readFile(join(cacheDir, file), 'utf-8'));
+    expect(transcript.success).toBe(false);
+    expect(transcript.messages).toEqual([{ type: 'assistant' }]);
+  });
+
+  it('should resolve after set_result without waiting for another message', async () => {
+    sdk.agent = async function* (options) {
+      yield { type: 'assistant' };
+      await callTool(options, 'set_result', { code: 'async () => ({ answer: 42 })' });
+      await never();
+    };
+
+    await expect(implement('Set a result', {}, { answer: z.number() })).resolves.toEqual({ answer: 42 });
+    expect(sdk.options!.abortController.signal.aborted).toBe(true);
+  });
+
+  it('should reject promptly after bail', async () => {
+    sdk.agent = async function* (options) {
+      yield { type: 'assistant' };
+      await callTool(options, 'bail', { message: 'no data' });
+      await never();
+    };
+
+    await expect(implement('Bail out', {}, { answer: z.number() })).rejects.toThrow(
+      'Agent could not complete the task: no data'
+    );
+    expect(sdk.options!.abortController.signal.aborted).toBe(true);
+  });
+
+  it('should reject with the signal reason when the caller aborts', async () => {
+    const controller = new AbortController();
+    sdk.agent = async function* () {
+      yield { type: 'assistant' };
+      controller.abort(new Error('cancelled by caller'));
+      await never();
+    };
+
+    await expect(
+      implement('Get cancelled', {}, { answer: z.number() }, { signal: controller.signal })
+    ).rejects.toThrow('cancelled by caller');
+    expect(sdk.options!.abortController.signal.aborted).toBe(true);
+  });
+});
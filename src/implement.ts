@@ -1,23 +1,66 @@
 import type { ImplementOptions } from './types.js';
 import { z } from 'zod';
-import { query } from '@anthropic-ai/claude-agent-sdk';
 import Mustache from 'mustache';
 import { zodToJsonSchema } from 'zod-to-json-schema';
 import { TRACE } from '@/utils/logging.js';
 import { createVmExecutor } from './vm-executor.js';
-import { createMcpServer } from './mcp-server.js';
 import { Transcript } from './transcript.js';
 import { getCacheKey, getCachePath, loadCachedTranscript } from './cache.js';
 import { generateCombinedCode } from './transcript-codegen.js';
 import { IMPLEMENT_PROMPT_TEMPLATE } from './strings.js';
 import { extractCallStack, buildContext } from './agent-runner.js';
 
+interface CompiledSchema {
+  /** Zod object validator for results */
+  validator: z.ZodObject<Record<string, z.ZodTypeAny>>;
+  /** JSON Schema sent to the agent */
+  jsonSchema: ReturnType<typeof zodToJsonSchema>;
+  /** Pretty-printed JSON Schema rendered into the prompt */
+  schemaText: string;
+  /** Compact JSON Schema used for the cache key */
+  serializedSchema: string;
+  /** Fields of the schema record when it was compiled */
+  fields: Array<[string, z.ZodTypeAny]>;
+}
+
+// Compiled schema per schema object, so repeated calls with the same schema
+// skip validator construction, conversion and serialization
+const compiledSchemas = new WeakMap<Record<string, z.ZodTypeAny>, CompiledSchema>();
+
+/**
+ * Checks that a schema record still has the fields it was compiled with,
+ * since callers may add or replace fields between calls
+ */
+function hasSameFields(compiled: CompiledSchema, schema: Record<string, z.ZodTypeAny>): boolean {
+  return (
+    Object.keys(schema).length === compiled.fields.length &&
+    compiled.fields.every(([key, field]) => schema[key] === field)
+  );
+}
+
+function compileSchema(schema: Record<string, z.ZodTypeAny>): CompiledSchema {
+  let compiled = compiledSchemas.get(schema);
+  if (!compiled || !hasSameFields(compiled, schema)) {
+    const validator = z.object(schema);
+    const jsonSchema = zodToJsonSchema(validator);
+    compiled = {
+      validator,
+      jsonSchema,
+      schemaText: JSON.stringify(jsonSchema, null, 2),
+      serializedSchema: JSON.stringify(jsonSchema),
+      fields: Object.entries(schema),
+    };
+    compiledSchemas.set(schema, compiled);
+  }
+  return compiled;
+}
+
 /**
  * Implements functionality using Claude AI with structured output
  *
  * @param prompt - Description of what to implement
  * @param context - Context variables to make available
- * @param schema - Zod schema for the expected result
+ * @param schema - Zod schema for the expected result; its compiled form is cached per record and rebuilt if fields are added or replaced
  * @param options - Optional configuration (signal, server settings)
  * @returns Promise that resolves with the validated result matching the schema
  */
@@ -40,12 +83,12 @@ export function implement<Schema extends Record<string, z.ZodTypeAny>>(
 
   return (async () => {
     // Convert schema to JSON Schema
-    const jsonSchema = zodToJsonSchema(z.object(schema));
-    const schemaObject = z.object(schema);
+    const { validator, jsonSchema, schemaText, serializedSchema } = compileSchema(schema);
+    const schemaObject = validator as z.ZodObject<Schema>;
     type ResultType = z.infer<z.ZodObject<Schema>>;
 
     // Check cache first
-    const cacheKey = getCacheKey(prompt, jsonSchema);
+    const cacheKey = getCacheKey(prompt, serializedSchema);
     const cachePath = getCachePath(cacheKey);
     const cacheMode = process.env.KLENDATHU_CACHE_MODE || 'normal';
     const shouldIgnoreCache = cacheMode === 'ignore';
@@ -78,7 +121,7 @@ export function implement<Schema extends Record<string, z.ZodTypeAny>>(
     // Render prompt
     const renderedPrompt = Mustache.render(IMPLEMENT_PROMPT_TEMPLATE, {
       instruction: prompt,
-      schema: JSON.stringify(jsonSchema, null, 2),
+      schema: schemaText,
       context: contextItems,
       callStack,
       timestamp,
@@ -91,15 +134,45 @@ export function implement<Schema extends Record<string, z.ZodTypeAny>>(
     transcript.setTaskDetails(prompt, jsonSchema, contextItems);
     let computedResult: unknown;
 
+    // Aborted once the loop stops, so the agent cannot keep running tools
+    // against the caller's context after implement() settles
+    const abortController = new AbortController();
+
+    // Resolved once set_result or bail finishes, or the caller aborts, so the
+    // message loop wakes up immediately instead of waiting for the agent's next message
+    let loopStopped = false;
+    let stopLoop!: () => void;
+    const stopped = new Promise<null>((resolve) => {
+      stopLoop = () => {
+        loopStopped = true;
+        abortController.abort();
+        resolve(null);
+      };
+    });
+    vmExecutor.getCompletion().catch(() => stopLoop());
+    const onAbort = () => {
+      TRACE`Caller aborted, stopping message loop`;
+      stopLoop();
+    };
+    options.signal?.throwIfAborted();
+    options.signal?.addEventListener('abort', onAbort, { once: true });
+
+    // Loaded on demand so importing klendathu, and cache hits, never pay for the agent SDK
+    const [{ query }, { createMcpServer }] = await Promise.all([
+      import('@anthropic-ai/claude-agent-sdk'),
+      import('./mcp-server.js'),
+    ]);
+
     // Create in-process MCP server
     TRACE`Creating in-process MCP server`;
     const mcpServer = createMcpServer(vmExecutor, {
       onSetResult: (result) => {
         computedResult = result;
-        TRACE`Stored set_result result: ${JSON.stringify(result)}`;
+        TRACE`Stored set_result result: ${result}`;
       },
       abort: () => {
-        TRACE`set_result completed, will exit after current iteration`;
+        TRACE`set_result completed, stopping message loop`;
+        stopLoop();
       },
       onToolCall: (tool, code, result) => {
         transcript.record(tool, code, result);
@@ -121,18 +194,33 @@ export function implement<Schema extends Record<string, z.ZodTypeAny>>(
             klendathu: mcpServer,
           },
           allowedTools: ['Read', 'Grep'],
+          abortController,
         },
       });
       TRACE`query() call initiated, starting message loop`;
 
-      for await (const message of result) {
-        TRACE`Received message type: ${message.type}`;
-        transcript.recordMessage(message);
-        // If result was computed via set_result, we can exit the loop
-        if (computedResult !== undefined) {
+      const messages = result[Symbol.asyncIterator]();
+      while (true) {
+        const pending = messages.next();
+        const next = await Promise.race([pending, stopped]);
+        if (next === null) {
+          TRACE`Message loop stopped, query aborted`;
+          // The outstanding next() rejects once the query is aborted
+          pending.catch(() => {});
+          messages.return?.(undefined).catch(() => {});
+          break;
+        }
+        if (next.done) {
+          // Without set_result or bail the completion promise would never settle
+          if (!loopStopped) {
+            throw new Error('Agent finished without calling set_result or bail');
+          }
           break;
         }
+        TRACE`Received message type: ${next.value.type}`;
+        transcript.recordMessage(next.value);
       }
+      options.signal?.throwIfAborted();
 
       // Save transcript
       const success = computedResult !== undefined;
@@ -150,6 +238,8 @@ export function implement<Schema extends Record<string, z.ZodTypeAny>>(
       TRACE`Implementation failed: ${error}`;
       await transcript.save(cachePath, false);
       throw error;
+    } finally {
+      options.signal?.removeEventListener('abort', onAbort);
     }
   })();
 }
@@ -0,0 +1,54 @@
+import { describe, it, expect, vi } from 'vitest';
+import { z } from 'zod';
+import { createVmExecutor } from './vm-executor.js';
+import { createMcpServer } from './mcp-server.js';
+
+// Expose the tool definitions instead of starting a real MCP server
+vi.mock('@anthropic-ai/claude-agent-sdk', () => ({
+  tool: (name: string, description: string, inputSchema: unknown, handler: unknown) => ({ name, description, inputSchema, handler }),
+  createSdkMcpServer: (options: unknown) => options,
+}));
+
+type ToolResponse = { content: Array<{ type: 'text'; text: string }>; isError?: boolean };
+type ToolHandler = (args: Record<string, unknown>) => Promise<ToolResponse>;
+
+function getToolHandler(server: unknown, name: string): ToolHandler {
+  const { tools } = server as { tools: Array<{ name: string; handler: ToolHandler }> };
+  return tools.find((t) => t.name === name)!.handler;
+}
+
+describe('eval_batch tool', () => {
+  it('should run steps in order with shared vars and record each one as an eval', async () => {
+    const executor = createVmExecutor({ base: 10 }, z.object({}));
+    const calls: unknown[][] = [];
+    const server = createMcpServer(executor, { onToolCall: (...args) => calls.push(args) });
+    const codes = ['async () => { vars.n = context.base; return vars.n; }', 'async () => vars.n * 2'];
+
+    const response = await getToolHandler(server, 'eval_batch')({ codes });
+
+    expect(response.isError).toBeUndefined();
+    expect(JSON.parse(response.content[0].text)).toEqual([{ result: 10 }, { result: 20 }]);
+    expect(calls).toEqual([
+      ['eval', codes[0], { error: false, data: { result: 10 } }],
+      ['eval', codes[1], { error: false, data: { result: 20 } }],
+    ]);
+  });
+
+  it('should stop at the first failing step', async () => {
+    const executor = createVmExecutor({}, z.object({}));
+    const calls: unknown[][] = [];
+    const server = createMcpServer(executor, { onToolCall: (...args) => calls.push(args) });
+    const codes = [
+      'async () => 1',
+      'async () => { throw new Error("boom"); }',
+      'async () => { vars.after = true; }',
+    ];
+
+    const response = await getToolHandler(server, 'eval_batch')({ codes });
+
+    expect(response.isError).toBe(true);
+    expect(JSON.parse(response.content[0].text)).toEqual([{ result: 1 }, { error: 'boom' }]);
+    expect(calls).toEqual([['eval', codes[0], { error: false, data: { result: 1 } }]]);
+    expect((await executor.eval('async () => vars.after')).result).toBeUndefined();
+  });
+});
@@ -1,3 +1,4 @@
+import { types } from 'node:util';
 import { createSdkMcpServer, tool } from '@anthropic-ai/claude-agent-sdk';
 import { z } from 'zod';
 import { TRACE } from '@/utils/logging.js';
@@ -6,6 +7,50 @@ import { ToolResultSchema } from './transcript.js';
 
 export type ToolResult = z.infer<typeof ToolResultSchema>;
 
+// Tool input shapes are fixed, so build them once rather than per server
+const EVAL_INPUT = {
+  code: z.string().describe('Function expression to evaluate'),
+};
+
+const EVAL_BATCH_INPUT = {
+  codes: z.array(z.string()).describe('Function expressions to evaluate in order'),
+};
+
+const SET_RESULT_INPUT = {
+  code: z.string().describe('Code that produces the result'),
+};
+
+const BAIL_INPUT = {
+  message: z.string().describe('Error message explaining why the task cannot be completed'),
+};
+
+/**
+ * Logs a tool failure and returns its message
+ */
+function reportToolError(toolName: string, error: unknown): string {
+  // Errors thrown by agent code come from the vm realm, so instanceof Error misses them
+  const errorText = types.isNativeError(error) ? error.message : String(error);
+  TRACE`${toolName} error: ${errorText}`;
+  console.error(`Error in ${toolName}: ${errorText}`);
+  return errorText;
+}
+
+/**
+ * Reports a tool failure and builds the error response returned to the agent
+ */
+function toolError(toolName: string, error: unknown) {
+  const errorText = reportToolError(toolName, error);
+  return {
+    content: [
+      {
+        type: 'text' as const,
+        text: `Error: ${errorText}`,
+      },
+    ],
+    isError: true,
+  };
+}
+
 /**
  * Creates in-process MCP server that calls VM executor directly (no HTTP delegation)
  */
@@ -16,72 +61,82 @@ export function createMcpServer(
   // Create eval tool that calls vmExecutor directly
   const evalTool = tool(
     'eval',
-    'Evaluates a JavaScript function expression',
-    {
-      code: z.string().describe('Function expression to evaluate'),
-    },
+    'Evaluates a JavaScript function expression. Prefer eval_batch when multiple steps are ready at once',
+    EVAL_INPUT,
     async ({ code }) => {
       TRACE`MCP eval tool called with code length: ${code.length}`;
       try {
-        const response = await vmExecutor.eval(code);
-        const data = response as any;
+        // vmExecutor.eval throws on failure, so a response is always a success
+        const data = await vmExecutor.eval(code);
 
         // Build ToolResult
-        let toolResult: ToolResult;
-        if (data.error) {
-          toolResult = {
-            error: true,
-            message: data.message || 'Unknown error',
-            stack: data.stack,
-          };
-        } else {
-          toolResult = {
-            error: false,
-            data,
-          };
-        }
+        const toolResult: ToolResult = {
+          error: false,
+          data,
+        };
 
         if (options?.onToolCall) {
           options.onToolCall('eval', code, toolResult);
         }
 
-        // Check for error in response body
-        if (data.error) {
-          const errorText = `${data.message}${data.stack ? '\n' + data.stack : ''}`;
-          TRACE`eval error response: ${errorText}`;
+        return {
+          content: [
+            {
+              type: 'text' as const,
+              text: JSON.stringify(data),
+            },
+          ],
+        };
+      } catch (error) {
+        return toolError('eval', error);
+      }
+    }
+  );
+
+  // Create eval_batch tool that runs several evals in one tool call
+  const evalBatchTool = tool(
+    'eval_batch',
+    'Evaluates several JavaScript function expressions in order, stopping at the first error',
+    EVAL_BATCH_INPUT,
+    async ({ codes }) => {
+      TRACE`MCP eval_batch tool called with ${codes.length} expressions`;
+      const results: unknown[] = [];
+      for (const code of codes) {
+        try {
+          const data = await vmExecutor.eval(code);
+          const toolResult: ToolResult = {
+            error: false,
+            data,
+          };
+
+          // Record each step as its own eval so cached replay stays unchanged
+          if (options?.onToolCall) {
+            options.onToolCall('eval', code, toolResult);
+          }
+          results.push(data);
+        } catch (error) {
+          const errorText = reportToolError(`eval_batch step ${results.length}`, error);
+          results.push({ error: errorText });
           return {
             content: [
               {
                 type: 'text' as const,
-                text: errorText,
+                text: JSON.stringify(results),
               },
             ],
             isError: true,
           };
         }
-
-        return {
-          content: [
-            {
-              type: 'text' as const,
-              text: JSON.stringify(data, null, 2),
-            },
-          ],
-        };
-      } catch (error) {
-        const errorText = error instanceof Error ? error.message : String(error);
-        TRACE`eval error: ${errorText}`;
-        console.error(`Error in eval: ${errorText}`);
-        return {
-          content: [
-            {
-              type: 'text' as const,
-              text: `Error: ${errorText}`,
-            },
-          ],
-          isError: true,
-        };
       }
+
+      return {
+        content: [
+          {
+            type: 'text' as const,
+            text: JSON.stringify(results),
+          },
+        ],
+      };
     }
   );
 
@@ -89,9 +144,7 @@ export function createMcpServer(
   const setResultTool = tool(
     'set_result',
     'Execute code to produce final result',
-    {
-      code: z.string().describe('Code that produces the result'),
-    },
+    SET_RESULT_INPUT,
     async ({ code }) => {
       TRACE`MCP set_result tool called with code length: ${code.length}`;
       try {
@@ -108,7 +161,7 @@ export function createMcpServer(
         }
 
         // Store result and abort query
-        TRACE`set_result computed: ${JSON.stringify(result)}`;
+        TRACE`set_result computed: ${result}`;
         if (options?.onSetResult) {
           options.onSetResult(result);
         }
@@ -124,18 +177,7 @@ export function createMcpServer(
           ],
         };
       } catch (error) {
-        const errorText = error instanceof Error ? error.message : String(error);
-        TRACE`set_result error: ${errorText}`;
-        console.error(`Error in set_result: ${errorText}`);
-        return {
-          content: [
-            {
-              type: 'text' as const,
-              text: `Error: ${errorText}`,
-            },
-          ],
-          isError: true,
-        };
+        return toolError('set_result', error);
       }
     }
   );
@@ -144,9 +186,7 @@ export function createMcpServer(
   const bailTool = tool(
     'bail',
     'Fail the implementation with an error message',
-    {
-      message: z.string().describe('Error message explaining why the task cannot be completed'),
-    },
+    BAIL_INPUT,
     async ({ message }) => {
       TRACE`MCP bail tool called with message: ${message}`;
       vmExecutor.setBailError(message);
@@ -166,6 +206,6 @@ export function createMcpServer(
   return createSdkMcpServer({
     name: 'klendathu',
     version: '0.1.0',
-    tools: [evalTool, setResultTool, bailTool],
+    tools: [evalTool, evalBatchTool, setResultTool, bailTool],
   });
 }
@@ -37,7 +37,7 @@ You will be given the following context variables:
 
 # Available Tools
 
-You have access to three MCP tools:
+You have access to four MCP tools:
 
 1. "eval" - Execute JavaScript code to set up state and compute values (optional)
    - Your code runs in a persistent context, so variables you create are available in later calls
@@ -49,7 +49,13 @@ You have access to three MCP tools:
    - Example: "async () => { const result = await context.page.goto('https://example.com'); vars.url = context.page.url(); return { navigated: true }; }"
    - All eval calls are recorded and will be replayed when cached
 
-2. "set_result" - Execute a code block to produce your final result
+2. "eval_batch" - Execute several eval functions in one call (optional)
+   - Takes a single parameter: codes (array of function expressions, same format as eval)
+   - Runs them in order in the same persistent context and returns an array of their results
+   - Stops at the first error; the failing entry is reported as { error: message }
+   - Prefer this over several separate eval calls when you have multiple steps ready at once
+
+3. "set_result" - Execute a code block to produce your final result
    - The code must be an async function that returns your final result
    - Function format: "async () => { /* your code */ return { /* result object */ }; }"
    - The returned object must match the schema exactly
@@ -57,7 +63,7 @@ You have access to three MCP tools:
    - Example: "async () => { return { result: vars.items, count: vars.items.length }; }"
    - Example combining vars and context: "async () => { return { greeting: \`Hello, \${context.name}!\`, processed: vars.processed }; }"
 
-3. "bail" - Fail the implementation with an error message
+4. "bail" - Fail the implementation with an error message
    - Use this when the task is impossible or cannot be completed
    - Takes a single parameter: message (string explaining why the task cannot be completed)
    - Example: "Cannot complete: the impossible constraint requires a number >= 10 AND <= 5 which is mathematically impossible"
@@ -78,7 +84,7 @@ Follow these steps to complete the implementation:
 
 # CRITICAL: Your Workflow Must Be Exactly
 
-1. Use eval() if you need to compute values or perform state mutations/side effects (optional, only when needed)
+1. Use eval() or eval_batch() if you need to compute values or perform state mutations/side effects (optional, only when needed)
 2. Call set_result() with code that returns the final result object
 3. STOP - do not provide any explanations after calling set_result
 
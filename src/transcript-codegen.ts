@@ -39,11 +39,7 @@ export function generateCombinedCode(calls: ToolCall[]): string {
 
   // Add each eval call inline
   for (const call of callsBeforeFinal) {
-    // Extract the function body from the async function
-    // Code is like: async () => { ... }
-    // We need to extract just the body
-    const functionBody = extractFunctionBody(call.code);
-    TRACE`Adding eval call to combined code (body length: ${functionBody.length})`;
+    TRACE`Adding eval call to combined code (code length: ${call.code.length})`;
     combinedCode += `\n  // eval call\n  await (${call.code})();\n`;
   }
 
@@ -56,17 +52,3 @@ export function generateCombinedCode(calls: ToolCall[]): string {
   TRACE`Generated combined code: ${combinedCode.length} characters`;
   return combinedCode;
 }
-
-/**
- * Extracts the body of an async function expression.
- * Input: async () => { ... }
- * Output: { ... }
- */
-function extractFunctionBody(code: string): string {
-  // Match: async () => { ... } or async () => ...
-  const match = code.match(/async\s*\(\s*\)\s*=>\s*(\{[\s\S]*\}|\S[\s\S]*)/);
-  if (match && match[1]) {
-    return match[1];
-  }
-  return code;
-}
@@ -87,7 +87,7 @@ export class Transcript {
     };
 
     TRACE`Saving transcript with success=${success}, ${this.messages.length} messages and ${this.calls.length} calls to ${cachePath}`;
-    saveCachedTranscript(cachePath, data);
+    await saveCachedTranscript(cachePath, data);
   }
 
   getCalls(): ToolCall[] {
@@ -13,6 +13,34 @@ const TRACE_ENABLED = process.env.KLENDATHU_TRACE === '1' || process.env.KLENDAT
 const TRACE_DIR = join(homedir(), '.klendathu');
 const TRACE_FILE = join(TRACE_DIR, 'trace.log');
 
+// Log lines are buffered and appended in batches instead of one write per call
+const FLUSH_INTERVAL_MS = 5;
+const MAX_PENDING_LINES = 32;
+let pendingLines: string[] = [];
+let flushTimer: ReturnType<typeof setTimeout> | null = null;
+
+/**
+ * Append all buffered log lines to the trace file in a single write.
+ */
+function flushTrace(): void {
+  if (flushTimer) {
+    clearTimeout(flushTimer);
+    flushTimer = null;
+  }
+  if (pendingLines.length === 0) {
+    return;
+  }
+
+  const chunk = pendingLines.join('');
+  pendingLines = [];
+
+  try {
+    appendFileSync(TRACE_FILE, chunk);
+  } catch {
+    // Silently fail - don't disrupt the application
+  }
+}
+
 // Initialize trace file if tracing is enabled
 if (TRACE_ENABLED) {
   try {
@@ -21,6 +49,8 @@ if (TRACE_ENABLED) {
   } catch (err) {
     console.error('Failed to initialize trace log:', err);
   }
+  // Make sure buffered lines are not lost when the process exits
+  process.on('exit', flushTrace);
 }
 
 /**
@@ -104,9 +134,11 @@ export function TRACE(strings: TemplateStringsArray, ...values: any[]): void {
 
   const logLine = `[${timestamp}] [PID:${pid}] [${location}] ${message}\n`;
 
-  try {
-    appendFileSync(TRACE_FILE, logLine);
-  } catch {
-    // Silently fail - don't disrupt the application
+  pendingLines.push(logLine);
+  if (pendingLines.length >= MAX_PENDING_LINES) {
+    flushTrace();
+  } else if (!flushTimer) {
+    flushTimer = setTimeout(flushTrace, FLUSH_INTERVAL_MS);
+    flushTimer.unref?.();
   }
 }
@@ -0,0 +1,76 @@
+import { describe, it, expect } from 'vitest';
+import { z } from 'zod';
+import { createVmExecutor } from './vm-executor.js';
+
+describe('createVmExecutor', () => {
+  it('should evaluate code against context and capture console output', async () => {
+    const executor = createVmExecutor({ items: [1, 2, 3] }, z.object({}));
+
+    const output = await executor.eval('async () => { console.log("count", context.items.length); return context.items; }');
+
+    expect(output.result).toEqual([1, 2, 3]);
+    expect(output.console).toEqual([{ level: 'log', args: ['count', 3] }]);
+  });
+
+  it('should keep console output separate for concurrent evals', async () => {
+    const executor = createVmExecutor({}, z.object({}));
+
+    const [first, second] = await Promise.all([
+      executor.eval('async () => { await new Promise((r) => globalThis.setTimeout(r, 10)); console.log("first"); }'),
+      executor.eval('async () => { console.warn("second"); }'),
+    ]);
+
+    expect(first.console).toEqual([{ level: 'log', args: ['first'] }]);
+    expect(second.console).toEqual([{ level: 'warn', args: ['second'] }]);
+  });
+
+  it('should run repeated code against the current state', async () => {
+    const executor = createVmExecutor({}, z.object({}));
+    const code = 'async () => { vars.n = (vars.n ?? 0) + 1; return vars.n; }';
+
+    expect((await executor.eval(code)).result).toBe(1);
+    expect((await executor.eval(code)).result).toBe(2);
+  });
+
+  it('should share vars between eval and setResult', async () => {
+    const executor = createVmExecutor({ base: 20 }, z.object({ answer: z.number() }));
+
+    await executor.eval('async () => { vars.doubled = context.base * 2; }');
+    const result = await executor.setResult('async () => ({ answer: vars.doubled + 2 })');
+
+    expect(result).toEqual({ answer: 42 });
+    await expect(executor.getCompletion()).resolves.toEqual({ answer: 42 });
+  });
+
+  it('should reject results that do not match the schema', async () => {
+    const executor = createVmExecutor({}, z.object({ answer: z.number() }));
+
+    await expect(executor.setResult('async () => ({ answer: "nope" })')).rejects.toThrow('Validation failed');
+  });
+
+  it('should reject setResult after bail without running its code', async () => {
+    let validated = false;
+    const executor = createVmExecutor({}, z.object({ answer: z.number() }), () => {
+      validated = true;
+    });
+
+    // No one awaits getCompletion() yet, so the bail must not be an unhandled rejection
+    executor.setBailError('no data');
+    await expect(executor.setResult('async () => { vars.ran = true; return { answer: 42 }; }')).rejects.toThrow(
+      'Implementation already completed'
+    );
+
+    expect((await executor.eval('async () => vars.ran')).result).toBeUndefined();
+    expect(validated).toBe(false);
+    await expect(executor.getCompletion()).rejects.toThrow('Agent could not complete the task: no data');
+  });
+
+  it('should ignore bail after setResult', async () => {
+    const executor = createVmExecutor({}, z.object({ answer: z.number() }));
+
+    await executor.setResult('async () => ({ answer: 42 })');
+    executor.setBailError('too late');
+
+    await expect(executor.getCompletion()).resolves.toEqual({ answer: 42 });
+  });
+});
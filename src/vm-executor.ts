@@ -24,6 +24,29 @@ const serializeValue = (value: any): any => {
   return value;
 };
 
+// Compiled scripts keyed by source, since agents often resend the same code
+const MAX_CACHED_SCRIPTS = 256;
+const scriptCache = new Map<string, vm.Script>();
+
+/**
+ * Returns a compiled script for the source, reusing a cached one when possible.
+ * Scripts are context-independent, so one compilation serves every executor.
+ */
+function compileScript(source: string): vm.Script {
+  let script = scriptCache.get(source);
+  if (script) {
+    // Re-insert to mark as most recently used
+    scriptCache.delete(source);
+  } else {
+    script = new vm.Script(source);
+    if (scriptCache.size >= MAX_CACHED_SCRIPTS) {
+      scriptCache.delete(scriptCache.keys().next().value!);
+    }
+  }
+  scriptCache.set(source, script);
+  return script;
+}
+
 export interface VmExecutor<Result = unknown> {
   eval(code: string): Promise<{ result: unknown; console?: Array<{ level: string; args: unknown[] }> }>;
   setResult(code: string): Promise<Result>;
@@ -36,11 +59,12 @@ export function createVmExecutor<Result = unknown>(
   schema: z.ZodType<Result>,
   validate?: (result: Result) => void | Promise<void>
 ): VmExecutor<Result> {
-  TRACE`createVmExecutor called with schema keys: ${JSON.stringify(Object.keys(schema))} schema._def: ${!!schema._def}`;
+  TRACE`createVmExecutor called with schema keys: ${Object.keys(schema)} schema._def: ${!!schema._def}`;
 
   // Shared vars object that persists across all eval and setResult calls
   const vars = {};
 
+  // Created once and shared by all eval and setResult calls
   const vmContext = vm.createContext({
     context,
     vars,
@@ -55,30 +79,38 @@ export function createVmExecutor<Result = unknown>(
     resolveCompletion = resolve;
     rejectCompletion = reject;
   });
+  // bail can reject before anyone awaits getCompletion(), so mark the rejection
+  // as handled here; callers awaiting getCompletion() still receive the error
+  completionPromise.catch(() => {});
+  // The first set_result or bail decides the outcome; later calls must not
+  // report success for a completion that has already been decided
+  let completed = false;
 
   return {
     async eval(code: string) {
       const consoleLogs: Array<{ level: string; args: any[] }> = [];
-      const captureConsole = (level: string) => (...args: any[]) => {
-        consoleLogs.push({ level, args });
-      };
-
-      const evalVmContext = vm.createContext({
-        context,
-        vars,
-        globalThis,
-        console: {
+      let capturedConsole: Record<string, (...args: any[]) => void> | undefined;
+
+      // Only build console capture when the code can actually log
+      if (code.includes('console')) {
+        const captureConsole = (level: string) => (...args: any[]) => {
+          consoleLogs.push({ level, args });
+        };
+        capturedConsole = {
           log: captureConsole('log'),
           error: captureConsole('error'),
           warn: captureConsole('warn'),
           info: captureConsole('info'),
           debug: captureConsole('debug'),
           trace: captureConsole('trace'),
-        },
-      });
+        };
+      }
 
-      const wrappedCode = `(async () => { const fn = ${code}; return await fn(); })()`;
-      const result = await vm.runInContext(wrappedCode, evalVmContext);
+      // Runs in the executor's shared context; console is passed per call so
+      // concurrent evals keep their output separate
+      const wrappedCode = `(async (console) => { const fn = ${code}; return await fn(); })`;
+      const run = compileScript(wrappedCode).runInContext(vmContext);
+      const result = await run(capturedConsole);
 
       const output: any = {
         result: serializeValue(result),
@@ -98,15 +130,19 @@ export function createVmExecutor<Result = unknown>(
       // Code should be in the form: 'async () => { ... }'
       const wrappedCode = `(${code})()`;
       try {
-        let value = await vm.runInContext(wrappedCode, vmContext);
-        if (value instanceof Promise) {
-          value = await value;
+        // Refuse before running the agent's code or the custom validator, so a
+        // late call has no side effects
+        if (completed) {
+          TRACE`Warning: set_result called after the implementation already completed`;
+          throw new Error('Implementation already completed');
         }
+
+        const value = await compileScript(wrappedCode).runInContext(vmContext);
         const serialized = serializeValue(value);
 
         // Validate against schema
         TRACE`Before safeParse - schema type: ${typeof schema}, has _def: ${!!schema._def}, has safeParse: ${!!schema.safeParse}`;
-        TRACE`Before safeParse - serialized: ${JSON.stringify(serialized)}`;
+        TRACE`Before safeParse - serialized: ${serialized}`;
         const validation = schema.safeParse(serialized);
         TRACE`After safeParse - success: ${validation.success}`;
         if (!validation.success) {
@@ -122,8 +158,15 @@ export function createVmExecutor<Result = unknown>(
           await validate(result);
         }
 
+        // Another call may have completed while this one was awaiting
+        if (completed) {
+          TRACE`Warning: set_result called after the implementation already completed`;
+          throw new Error('Implementation already completed');
+        }
+
         // Resolve the completion promise
-        TRACE`Resolving completion promise with: ${JSON.stringify(result).substring(0, 100)}`;
+        TRACE`Resolving completion promise`;
+        completed = true;
         resolveCompletion!(result);
         TRACE`Completion promise resolved`;
         return result;
@@ -136,6 +179,11 @@ export function createVmExecutor<Result = unknown>(
     setBailError(message: string) {
       const error = new Error(`Agent could not complete the task: ${message}`);
       TRACE`setBailError called: ${error.message}`;
+      if (completed) {
+        TRACE`Warning: ignoring bail after the implementation already completed`;
+        return;
+      }
+      completed = true;
       rejectCompletion!(error);
     },
 
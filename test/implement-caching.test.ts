@@ -31,21 +31,16 @@ describe('implement() caching', () => {
 
     try {
       // First run - creates cache
-      console.log('First run (creating cache)...');
       const result1 = await implement(prompt, {}, schema);
       expect(result1.result).toBe(42);
 
       // Verify cache was created
       const cacheFiles = readdirSync(tempCacheDir);
       expect(cacheFiles.length).toBe(1);
-      console.log(`Cache file created: ${cacheFiles[0]}`);
 
       // Second run - must use cache
-      console.log('Second run (using cache with forceUseCache: true)...');
       const result2 = await implement(prompt, {}, schema, { forceUseCache: true });
       expect(result2.result).toBe(42);
-
-      console.log('Cache test passed!');
     } finally {
       // Restore original env
       if (oldEnv !== undefined) {
@@ -18,7 +18,6 @@ describe('implement() simple tests', () => {
       schema
     );
 
-    console.log('Result:', result);
     expect(result.doubled).toEqual([2, 4, 6, 8, 10]);
   }, 120000);
 
@@ -34,7 +33,6 @@ describe('implement() simple tests', () => {
       schema
     );
 
-    console.log('Result:', result);
     expect(result.name).toBe('Alice');
     expect(result.greeting).toContain('Alice');
   }, 120000);
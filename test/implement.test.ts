@@ -80,11 +80,6 @@ Steps:
         automationSchema
       );
 
-      console.log('=== Automation Result ===');
-      console.log(JSON.stringify(result, null, 2));
-      console.log(`Expected: ${randomResult}`);
-      console.log('=== End Result ===');
-
       expect(result.formFilled).toBe(true);
       expect(result.resultText).toBe(randomResult);
     } finally {
@@ -115,10 +110,6 @@ Steps:
       transformSchema
     );
 
-    console.log('=== Transform Result ===');
-    console.log(JSON.stringify(result, null, 2));
-    console.log('=== End Result ===');
-
     expect(result.upperCaseNames).toEqual(['LAPTOP', 'MOUSE', 'KEYBOARD']);
     expect(result.totalPrice).toBeCloseTo(1109.97, 2);
     expect(result.itemCount).toBe(3);
@@ -150,10 +141,6 @@ Steps:
       extractionSchema
     );
 
-    console.log('=== Extracted Data ===');
-    console.log(JSON.stringify(result.extractedData, null, 2));
-    console.log('=== End Extracted Data ===');
-
     expect(result.extractedData.title).toBe('Product List');
     expect(result.extractedData.itemCount).toBe(5);
     expect(result.extractedData.items).toEqual(['Laptop', 'Mouse', 'Keyboard', 'Monitor', 'Webcam']);
@@ -172,10 +159,6 @@ Steps:
       sortSchema
     );
 
-    console.log('=== Sorting Result ===');
-    console.log(`Sorted Array: ${result.sorted}`);
-    console.log('=== End Sorting Result ===');
-
     expect(result.sorted).toEqual([90, 64, 34, 25, 22, 12, 11]);
   }, 60000);
 });